@@ -45,6 +45,9 @@ def init_db(force=False):
             );
             """
             cur.execute(sql)
+            # list/summary/report queries filter or order on these columns
+            cur.execute("CREATE INDEX IF NOT EXISTS expenses_created_at_idx ON expenses (created_at DESC);")
+            cur.execute("CREATE INDEX IF NOT EXISTS expenses_category_created_idx ON expenses (category, created_at DESC);")
             conn.commit()
             logging.info("Initialized database and ensured table exists.")
 
@@ -162,17 +165,35 @@ def category_report():
     headers = ["Category", "Count", "Total"]
     print(tabulate(table, headers=headers, tablefmt="fancy_grid"))
 
-def export_csv(filename="expenses_export.csv", **filters):
-    rows = query_expenses(**filters)
-    if not rows:
-        print("No data to export.")
-        return
-    keys = rows[0].keys()
-    with open(filename, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=keys)
-        writer.writeheader()
-        writer.writerows(rows)
-    print(f"Exported {len(rows)} rows to {filename}")
+def export_csv(filename="expenses_export.csv", limit=50, since=None, until=None, category=None):
+    # Stream straight from Postgres via COPY so rows never materialize in Python
+    sql = "SELECT * FROM expenses WHERE 1=1"
+    params = []
+
+    if since:
+        sql += " AND created_at >= %s"
+        params.append(since)
+    if until:
+        sql += " AND created_at <= %s"
+        params.append(until)
+    if category:
+        sql += " AND category = %s"
+        params.append(category)
+    sql += " ORDER BY created_at DESC"
+    if limit:
+        sql += " LIMIT %s"
+        params.append(limit)
+
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            # COPY takes no bind parameters, so interpolate them safely first
+            sql = cur.mogrify(sql, params).decode()
+            with open(filename, "wb", buffering=1 << 20) as f:
+                cur.copy_expert(f"COPY ({sql}) TO STDOUT WITH CSV HEADER", f)
+            if cur.rowcount == 0:
+                print("No data to export.")
+                return
+            print(f"Exported {cur.rowcount} rows to {filename}")
 
 def import_csv(filename="expenses_export.csv"):
     if not os.path.exists(filename):